@@ -1,15 +1,22 @@
 import operator
+import re
+from functools import lru_cache
 from typing import Literal
 from agents.state import GaiaState
 
 ''' util functions '''
 
+# Prefixes/wrappers stripped from type hints when rendering them for a prompt
+_TYPE_NOISE_RE = re.compile(r"typing\.|agents\.state\.|<class '|'>")
+
 # Unused but nice to keep
+@lru_cache(maxsize=None)
 def create_type_string(typed_dict_class: type) -> str:
     """
     Generates a TypeScript-like string representation of a TypedDict class.
     This includes the class's primary docstring and a listing of its attributes with their type hints.
     It's designed to be used in LLM prompts to provide clear schema definitions.
+    The rendered string is cached per class since a TypedDict's annotations don't change at runtime.
 
     Args:
         typed_dict_class (type): The TypedDict class (e.g., PlanStep, HistoryEntry, AgentState)
@@ -23,9 +30,11 @@ def create_type_string(typed_dict_class: type) -> str:
     class_doc = typed_dict_class.__doc__ if typed_dict_class.__doc__ else f"Represents the {class_name} structure."
 
     # Start the string with the class name and its main docstring
-    type_string = f"### {class_name}\n"
-    type_string += f"{class_doc.strip()}\n\n"
-    type_string += f"```typescript\ntype {class_name} = {{\n"
+    parts = [
+        f"### {class_name}\n",
+        f"{class_doc.strip()}\n\n",
+        f"```typescript\ntype {class_name} = {{\n"
+    ]
 
     # Iterate through the type hints to get field names and their string representations
     for field_name, field_type in typed_dict_class.__annotations__.items():
@@ -34,14 +43,13 @@ def create_type_string(typed_dict_class: type) -> str:
             continue  # Skip LangGraph's internal merge annotation if it's there
 
         # Get a cleaner string representation of the type
-        # This tries to remove "typing." prefix and module paths for brevity in the prompt
-        type_str = str(field_type).replace("typing.", "").replace("agents.state.", "").replace("<class '", "").replace(
-            "'>", "")
+        # This removes the "typing." prefix and module paths in a single pass for brevity in the prompt
+        type_str = _TYPE_NOISE_RE.sub("", str(field_type))
         # Handle specific Literal types for better readability if needed
         if isinstance(field_type, type(Literal)):
             type_str = str(field_type).replace("typing.Literal", "Literal").replace("'", '"')
 
-        type_string += f"    {field_name}: {type_str};\n"
+        parts.append(f"    {field_name}: {type_str};\n")
 
-    type_string += "}}\n```\n"
-    return type_string
+    parts.append("}\n```\n")
+    return "".join(parts)
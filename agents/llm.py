@@ -1,7 +1,14 @@
 # all llms are instantiated here
 from dotenv import load_dotenv
+import logging
 import os
+import threading
+from functools import wraps
 from typing import Optional
+
+import groq
+import httpx
+import openai
 from langchain.chat_models import init_chat_model
 from langchain_huggingface import HuggingFaceEndpoint
 from langchain_openai import ChatOpenAI  # For OpenRouter (using OpenAI compatible API)
@@ -14,6 +21,40 @@ from pydantic import SecretStr, Field
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Verbose LangChain/LangGraph output (debug=True on agents, verbose=True on LLMs) is opt-in via AGENT_DEBUG=1,
+# it prints every step of every ReAct loop which is costly on the default path
+AGENT_DEBUG = os.getenv("AGENT_DEBUG") == "1"
+
+# Optional LLM response cache, set LLM_CACHE_PATH (e.g. .langchain.db) to serve identical (model, messages) calls
+# from SQLite instead of the provider, useful when re-running the evaluation on the same questions
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+if LLM_CACHE_PATH:
+    from langchain_core.globals import set_llm_cache
+    from langchain_community.cache import SQLiteCache
+
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+
+# One keep-alive HTTP connection pool shared by every OpenAI-compatible (OpenRouter) and Groq client, so the agents reuse
+# the same TCP/TLS connections to the provider instead of each opening their own.
+# Only the sync client is shared, an httpx.AsyncClient is bound to the event loop it was first used on.
+SHARED_HTTP_CLIENT = httpx.Client(
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    timeout=httpx.Timeout(600.0, connect=5.0)
+)
+
+# Provider errors worth retrying (connection drops, timeouts, rate limits, 5xx), anything else is deterministic
+TRANSIENT_LLM_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    groq.APIConnectionError,
+    groq.RateLimitError,
+    groq.InternalServerError,
+    httpx.TransportError
+)
+
 
 # Custom ChatOpenRouter class
 class ChatOpenRouter(ChatOpenAI):
@@ -33,6 +74,30 @@ class ChatOpenRouter(ChatOpenAI):
 
 
 # --- Helper Functions to Instantiate LLMs from Providers ---
+# The helpers are memoized on their (hashable) arguments, chat models hold no per-conversation state so agents
+# configured with the same provider/model share one client instead of rebuilding it (and its HTTP pool) each time.
+# Only successfully created LLMs are kept, a helper returning None (missing key, provider error) is retried next call.
+# The lock makes concurrent callers of the same (provider, model) wait for the first one instead of each building a
+# client, it is re-entrant since the OpenRouter/Groq helpers can go through the (memoized) _try_init_llm.
+_llm_instances: dict[tuple, BaseChatModel] = {}
+_llm_instances_lock = threading.RLock()
+
+
+def _memoize_llm(create_llm):
+    @wraps(create_llm)
+    def memoized_create_llm(*args, **kwargs):
+        key = (create_llm.__name__, args, tuple(sorted(kwargs.items())))
+        with _llm_instances_lock:
+            llm = _llm_instances.get(key)
+            if llm is None:
+                llm = create_llm(*args, **kwargs)
+                if llm is not None:
+                    _llm_instances[key] = llm
+            return llm
+    return memoized_create_llm
+
+
+@_memoize_llm
 def _try_init_llm(provider: str, model_id: str, **kwargs) -> BaseChatModel | None:
     """
     Attempts to instantiate an LLM using init_chat_model for a given provider and model.
@@ -61,6 +126,9 @@ def _try_init_llm(provider: str, model_id: str, **kwargs) -> BaseChatModel | Non
         elif provider == "groq":
             kwargs["groq_api_key"] = api_key
 
+        if provider != "huggingface":
+            kwargs["http_client"] = SHARED_HTTP_CLIENT
+
         llm = init_chat_model(
             model=model_id,
             model_provider=provider if provider != "openrouter" else "openai",  # Use 'openai' for OpenRouter
@@ -75,6 +143,7 @@ def _try_init_llm(provider: str, model_id: str, **kwargs) -> BaseChatModel | Non
         return None
 
 
+@_memoize_llm
 def _create_hf_llm(model_id: str, task: str = "image-to-text") -> BaseChatModel | None:
     """
     Correctly instantiates a Hugging Face model using a two-step process:
@@ -98,7 +167,7 @@ def _create_hf_llm(model_id: str, task: str = "image-to-text") -> BaseChatModel
         )
 
         # Step 2: Pass the endpoint object to the ChatHuggingFace wrapper.
-        llm = ChatHuggingFace(llm=llm_endpoint, verbose=True)
+        llm = ChatHuggingFace(llm=llm_endpoint, verbose=AGENT_DEBUG)
 
         print(f"Successfully instantiated HuggingFace LLM: {model_id}")
         return llm
@@ -106,6 +175,7 @@ def _create_hf_llm(model_id: str, task: str = "image-to-text") -> BaseChatModel
         print(f"Failed to instantiate HuggingFace LLM {model_id}: {e}")
         return None
 
+@_memoize_llm
 def _create_openrouter_llm(model_id: str, use_init_llm: bool = False) -> BaseChatModel | None:
     """Attempts to instantiate an OpenRouter LLM using ChatOpenAI."""
     if use_init_llm:
@@ -120,7 +190,8 @@ def _create_openrouter_llm(model_id: str, use_init_llm: bool = False) -> BaseCha
         llm = ChatOpenRouter(
             model_name=model_id,
             temperature=0.3,
-            max_tokens=512
+            max_tokens=512,
+            http_client=SHARED_HTTP_CLIENT
         )
         print(f"Successfully instantiated OpenRouter LLM: {model_id}")
         return llm
@@ -129,6 +200,7 @@ def _create_openrouter_llm(model_id: str, use_init_llm: bool = False) -> BaseCha
         return None
 
 
+@_memoize_llm
 def _create_groq_llm(model_id: str, use_init_llm: bool = True) -> BaseChatModel | None:
     if use_init_llm:
         return _try_init_llm("groq", model_id)
@@ -144,7 +216,8 @@ def _create_groq_llm(model_id: str, use_init_llm: bool = True) -> BaseChatModel
             model_name=model_id,
             groq_api_key=groq_key,
             temperature=0.3,
-            max_tokens=512
+            max_tokens=512,
+            http_client=SHARED_HTTP_CLIENT
         )
         print(f"Successfully instantiated Groq LLM: {model_id}")
         return llm
@@ -159,19 +232,19 @@ def create_orchestrator_llm(use_hf: bool = False, use_or: bool = True, use_groq:
     if use_hf:
         llm = _create_hf_llm("deepseek-ai/DeepSeek-R1-Distill-Qwen-1.5B")
         if llm: return llm
-        print("~" * 60)
+        logger.debug("HuggingFace provider failed for the Orchestrator LLM, trying the next one")
 
     # Then OpenRouter
     if use_or:
         llm = _create_openrouter_llm("deepseek/deepseek-chat-v3-0324:free")
         if llm: return llm
-        print("~" * 60)
+        logger.debug("OpenRouter provider failed for the Orchestrator LLM, trying the next one")
 
     # Finally Groq
     if use_groq:
         llm = _create_groq_llm("deepseek-r1-distill-llama-70b")
         if llm: return llm
-        print("~" * 60)
+        logger.debug("Groq provider failed for the Orchestrator LLM, trying the next one")
 
     raise ValueError("Failed to instantiate Orchestrator LLM from any provider.")
 
@@ -182,19 +255,19 @@ def create_generic_llm(use_hf: bool = False, use_or: bool = True, use_groq: bool
     if use_hf:
         llm = _create_hf_llm("Qwen/QwQ-32B")  # A good general-purpose model
         if llm: return llm
-        print("~" * 60)
+        logger.debug("HuggingFace provider failed for the Generic LLM, trying the next one")
 
     # OpenRouter
     if use_or:
         llm = _create_openrouter_llm("deepseek/deepseek-chat-v3-0324:free")
         if llm: return llm
-        print("~" * 60)
+        logger.debug("OpenRouter provider failed for the Generic LLM, trying the next one")
 
     # Groq
     if use_groq:
         llm = _create_groq_llm("qwen/qwen3-32b")  # Groq's fast Llama3
         if llm: return llm
-        print("~" * 60)
+        logger.debug("Groq provider failed for the Generic LLM, trying the next one")
 
     raise ValueError("Failed to instantiate Audio LLM from any provider.")
 
@@ -205,19 +278,19 @@ def create_researcher_llm(use_hf: bool = False, use_or: bool = True, use_groq: b
     if use_hf:
         llm = _create_hf_llm("Qwen/QwQ-32B")  # A good general-purpose model
         if llm: return llm
-        print("~" * 60)
+        logger.debug("HuggingFace provider failed for the Researcher LLM, trying the next one")
 
     # OpenRouter
     if use_or:
         llm = _create_openrouter_llm("deepseek/deepseek-chat-v3-0324:free")
         if llm: return llm
-        print("~" * 60)
+        logger.debug("OpenRouter provider failed for the Researcher LLM, trying the next one")
 
     # Groq
     if use_groq:
         llm = _create_groq_llm("qwen/qwen3-32b")  # Groq's fast Llama3
         if llm: return llm
-        print("~" * 60)
+        logger.debug("Groq provider failed for the Researcher LLM, trying the next one")
 
     raise ValueError("Failed to instantiate Audio LLM from any provider.")
 
@@ -227,19 +300,19 @@ def create_audio_llm(use_hf: bool = False, use_or: bool = True, use_groq: bool =
     if use_hf:
         llm = _create_hf_llm("Qwen/QwQ-32B")  # A good general-purpose model
         if llm: return llm
-        print("~" * 60)
+        logger.debug("HuggingFace provider failed for the Audio LLM, trying the next one")
 
     # OpenRouter
     if use_or:
         llm = _create_openrouter_llm("deepseek/deepseek-chat-v3-0324:free")
         if llm: return llm
-        print("~" * 60)
+        logger.debug("OpenRouter provider failed for the Audio LLM, trying the next one")
 
     # Groq
     if use_groq:
         llm = _create_groq_llm("qwen/qwen3-32b")  # Groq's fast Llama3
         if llm: return llm
-        print("~" * 60)
+        logger.debug("Groq provider failed for the Audio LLM, trying the next one")
 
     raise ValueError("Failed to instantiate Audio LLM from any provider.")
 
@@ -249,13 +322,13 @@ def create_visual_llm(use_hf: bool = False, use_or: bool = True, use_groq: bool
     if use_hf:
         llm = _create_hf_llm("meta-llama/Llama-3.2-11B-Vision-Instruct")
         if llm: return llm
-        print("~" * 60)
+        logger.debug("HuggingFace provider failed for the Visual LLM, trying the next one")
 
     # OpenRouter (often has access to multi-modal models)
     if use_or:
         llm = _create_openrouter_llm("mistralai/mistral-small-3.2-24b-instruct:free")  # works
         if llm: return llm
-        print("~" * 60)
+        logger.debug("OpenRouter provider failed for the Visual LLM, trying the next one")
 
     # Fallback if no multi-modal found: a generic LLM (won't handle images directly)
     print("Warning: No multi-modal LLM found for Visual Agent. Falling back to generic LLM.")
@@ -268,19 +341,40 @@ def create_interpreter_llm(use_hf: bool = False, use_or: bool = True, use_groq:
     if use_hf:
         llm = _create_hf_llm("Qwen/Qwen2.5-Coder-32B-Instruct")
         if llm: return llm
-        print("~" * 60)
+        logger.debug("HuggingFace provider failed for the Code Interpreter LLM, trying the next one")
 
     # Then try OpenRouter
     if use_or:
         # llm = _create_openrouter_llm("mistralai/devstral-small:free")
         llm = _create_openrouter_llm("deepseek/deepseek-chat-v3-0324:free")
         if llm: return llm
-        print("~" * 60)
+        logger.debug("OpenRouter provider failed for the Code Interpreter LLM, trying the next one")
 
     # Finally Groq
     if use_groq:
         llm = _create_groq_llm("qwen-qwq-32b")
         if llm: return llm
-        print("~" * 60)
+        logger.debug("Groq provider failed for the Code Interpreter LLM, trying the next one")
 
     raise ValueError("Failed to instantiate Code Interpreter LLM from any provider.")
+
+
+def create_all_llms() -> dict[str, BaseChatModel]:
+    """
+    Instantiates the LLMs of every agent. Agents configured with the same provider/model get the same (memoized) client.
+    Construction is CPU-only (no network handshake), so the factories are simply called one after the other.
+
+    Returns:
+        dict[str, BaseChatModel]: the LLM of each agent keyed by agent name
+        ("orchestrator", "generic", "researcher", "audio", "visual", "code").
+        Raises the factory's ValueError if an agent's LLM can't be instantiated from any provider.
+    """
+    factories = {
+        "orchestrator": create_orchestrator_llm,
+        "generic": create_generic_llm,
+        "researcher": create_researcher_llm,
+        "audio": create_audio_llm,
+        "visual": create_visual_llm,
+        "code": create_interpreter_llm
+    }
+    return {agent_name: factory() for agent_name, factory in factories.items()}
@@ -1,52 +1,46 @@
 # agents/orchestrator.py
-from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langgraph.prebuilt import create_react_agent
 
-import os
 from langchain_core.language_models import BaseChatModel
+from agents.llm import AGENT_DEBUG
+from agents.prompts import create_react_prompt
+from agents.subagent import AGENT_CHECKPOINTER, trim_messages_hook
 from tools.orchestrator_tools import *
 
-def create_orchestrator_agent(orchestrator_llm: BaseChatModel):
+ORCHESTRATOR_PROMPT_FILE = 'orchestrator_prompt.txt'
+
+# The tools available to the Orchestrator, static so built once at import time
+# These are the "delegation tools" that instruct the orchestrator how to route
+ORCHESTRATOR_TOOLS = [
+    delegate_to_generic_agent,
+    delegate_to_researcher_agent,
+    delegate_to_audio_agent,
+    delegate_to_visual_agent,
+    delegate_to_code_agent,
+    provide_final_answer
+]
+
+
+def create_orchestrator_agent(orchestrator_llm: BaseChatModel, checkpointer=AGENT_CHECKPOINTER):
     """
     Creates and returns a LangChain ReAct orchestrator agent (Runnable).
     This agent's role is to analyze the user's request and delegate tasks
     to specialized sub-agents using specific "delegation tools".
+    Its ReAct loop is not checkpointed by default (see AGENT_CHECKPOINTER), only the outer workflow is.
     """
-    # 1. Define the tools available to the Orchestrator
-    # These are the "delegation tools" that instruct the orchestrator how to route
-    tools = [
-        delegate_to_generic_agent,
-        delegate_to_researcher_agent,
-        delegate_to_audio_agent,
-        delegate_to_visual_agent,
-        delegate_to_code_agent,
-        provide_final_answer
-    ]
-
-    # 2. Load the orchestrator prompt
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    prompts_dir = os.path.join(current_dir, '..', 'prompts')
-    orchestrator_prompt_path = os.path.join(prompts_dir, 'orchestrator_prompt.txt')
-
-    with open(orchestrator_prompt_path, "r", encoding="utf-8") as f:
-        orchestrator_prompt_content = f.read()
-
-    # 3. Create the ChatPromptTemplate using from_messages
-    orchestrator_prompt = ChatPromptTemplate.from_messages([
-        SystemMessage(content=orchestrator_prompt_content),
-        MessagesPlaceholder(variable_name="messages"),
-        HumanMessage(content="{input}\nThought:{agent_scratchpad}")
-    ])
+    # 1. Load the orchestrator prompt (file read and template build are cached)
+    orchestrator_prompt = create_react_prompt(ORCHESTRATOR_PROMPT_FILE)
 
-    # 4. Create the ReAct orchestrator agent executor
+    # 2. Create the ReAct orchestrator agent executor
     orchestrator_agent_runnable = create_react_agent(
         model=orchestrator_llm,
-        tools=tools,
+        tools=ORCHESTRATOR_TOOLS,
         prompt=orchestrator_prompt,
         name="orchestrator",
-        debug=True,
-        state_schema=GaiaState
+        debug=AGENT_DEBUG,
+        state_schema=GaiaState,
+        pre_model_hook=trim_messages_hook,
+        checkpointer=checkpointer
     )
 
-    return orchestrator_agent_runnable
\ No newline at end of file
+    return orchestrator_agent_runnable
@@ -0,0 +1,44 @@
+# all prompts are loaded here
+from functools import lru_cache
+from pathlib import Path
+
+from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+# Resolved once at import time, the prompts folder never moves while the process is running
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+
+@lru_cache(maxsize=None)
+def load_prompt(prompt_file_name: str) -> str:
+    """
+    Reads a prompt file from the prompts folder. The content is cached so that the file
+    is only read from disk once per process.
+
+    Args:
+        prompt_file_name (str): Name of the prompt file (e.g. 'audio_react_prompt.txt').
+
+    Returns:
+        str: The content of the prompt file.
+    """
+    # small files, read_text fetches the whole file in one go
+    return (PROMPTS_DIR / prompt_file_name).read_text(encoding="utf-8")
+
+
+@lru_cache(maxsize=None)
+def create_react_prompt(prompt_file_name: str) -> ChatPromptTemplate:
+    """
+    Builds the ReAct ChatPromptTemplate (system prompt + message history + scratchpad) for a prompt file.
+    The template is cached per prompt file so repeated agent construction skips the rebuild.
+
+    Args:
+        prompt_file_name (str): Name of the prompt file used as the system message.
+
+    Returns:
+        ChatPromptTemplate: The ReAct prompt template.
+    """
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=load_prompt(prompt_file_name)),
+        MessagesPlaceholder(variable_name="messages"),
+        HumanMessage(content="{input}\nThought:{agent_scratchpad}")
+    ])
@@ -8,23 +8,40 @@ class GaiaState(AgentState):
 
     Attributes:
         input (str): The initial user input that kicked off the workflow.
+        file_path (Optional[str]): Local path of the file attached to the task, if any. Used by the fast route
+                                   to delegate obvious cases (audio, image, code/spreadsheet) without an orchestrator turn.
         final_answer (Optional[str]): The definitive, synthesized answer to the `query`,
                                       populated by the `final_agent` when ready.
         subagent_input (Optional[Dict[str, Any]]): Stores the input provided to the currently executing sub-agent.
                                       This helps in tracking what specific task or information was delegated.
         subagent_output (Optional[str]): Stores the output received from the executed sub-agent.
                                          This allows the orchestrator to process and synthesize the sub-agent's results.
+        subagent_tool_call_id (Optional[str]): The id of the orchestrator's delegation tool call, recorded by the router
+                                               so the sub-agent can reply to it without re-scanning the messages.
         current_agent_name (Optional[str]): Tracks the name of the sub-agent currently active or
                                             most recently active in the workflow.
+        parallel_delegations (Optional[List[Dict[str, Any]]]): Set by the router when the orchestrator delegates
+                                            several independent tasks in one turn, each entry holds the agent_name,
+                                            args and tool_call_id of one delegation so they can be fanned out in parallel.
+        is_parallel_branch (Optional[bool]): Only set (True) in the Send payload of a fanned out delegation, tells the
+                                             sub-agent node to report back through messages alone.
+        queued_delegations (Optional[List[Dict[str, Any]]]): Only set in the Send payload of a sequential agent's
+                                             branch, the further delegations to that agent from the same orchestrator
+                                             turn, run one after the other once the branch's own task is done.
 
         messages, is_last_step and remaining_steps are derived from AgentState class
 
     """
     input: str
+    file_path: Optional[str]
     final_answer: Optional[str]
     subagent_input: Optional[Dict[str, Any]]
     subagent_output: Optional[str]
+    subagent_tool_call_id: Optional[str]
     current_agent_name: Optional[str]
+    parallel_delegations: Optional[List[Dict[str, Any]]]
+    is_parallel_branch: Optional[bool]
+    queued_delegations: Optional[List[Dict[str, Any]]]
 
 # Define the isolated state for each sub-agent
 class SubAgentState(AgentState):
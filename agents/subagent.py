@@ -0,0 +1,75 @@
+# shared building blocks for the ReAct agents
+import os
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool
+from langgraph.prebuilt.chat_agent_executor import create_react_agent
+
+from agents.llm import AGENT_DEBUG
+from agents.prompts import create_react_prompt
+from agents.state import SubAgentState
+
+# Checkpointer of the agents' own ReAct loops. False opts them out of inheriting the outer workflow's MemorySaver,
+# which would otherwise serialize their whole message history on every ReAct step. The outer graph checkpoints at
+# node boundaries, that is all a resumed run needs
+AGENT_CHECKPOINTER = False
+
+# Most messages sent to the LLM on each step of a ReAct loop, older ones (except the task itself) are left out
+# so the prompt stays bounded instead of growing with every tool round trip
+MAX_CONTEXT_MESSAGES = int(os.getenv("MAX_CONTEXT_MESSAGES", "20"))
+if MAX_CONTEXT_MESSAGES < 2:
+    # the task plus at least one recent message, below that the trimming window is empty
+    raise ValueError(f"MAX_CONTEXT_MESSAGES must be at least 2, got {MAX_CONTEXT_MESSAGES}")
+
+
+def trim_messages_hook(state) -> dict:
+    """
+    pre_model_hook keeping the LLM input to the first message (the task) plus the most recent messages.
+    The state's messages are left untouched, only what is sent to the LLM is trimmed.
+
+    Args:
+        state: The agent's state (any AgentState).
+
+    Returns:
+        dict: {"llm_input_messages": [...]} with at most MAX_CONTEXT_MESSAGES messages.
+    """
+    messages = state["messages"]
+    if len(messages) <= MAX_CONTEXT_MESSAGES:
+        return {"llm_input_messages": messages}
+
+    recent_messages = messages[-(MAX_CONTEXT_MESSAGES - 1):]
+    # never start on a ToolMessage, the AIMessage holding its tool call would have been cut off
+    start = 0
+    while start < len(recent_messages) and isinstance(recent_messages[start], ToolMessage):
+        start += 1
+    return {"llm_input_messages": [messages[0], *recent_messages[start:]]}
+
+
+def create_react_subagent(llm: BaseChatModel, tools: list[BaseTool], prompt_file_name: str, name: str,
+                          state_schema: type = SubAgentState, checkpointer=AGENT_CHECKPOINTER):
+    """
+    Creates a ReAct sub-agent (Runnable) running in its own isolated state.
+    All the ReAct sub-agents only differ by their tools, prompt and name, so they are built through this one code path.
+
+    Args:
+        llm (BaseChatModel): The LLM driving the agent's ReAct loop.
+        tools (list[BaseTool]): Tools exposed to the LLM.
+        prompt_file_name (str): Name of the system prompt file in the prompts folder (loaded through the cached loader).
+        name (str): Name of the agent.
+        state_schema (type): State of the agent's ReAct loop, SubAgentState by default.
+        checkpointer: Checkpointer of the agent's ReAct loop, AGENT_CHECKPOINTER (not checkpointed) by default.
+
+    Returns:
+        The compiled ReAct agent.
+    """
+    return create_react_agent(
+        model=llm,
+        tools=tools,
+        prompt=create_react_prompt(prompt_file_name),
+        name=name,
+        debug=AGENT_DEBUG,
+        state_schema=state_schema,
+        pre_model_hook=trim_messages_hook,
+        checkpointer=checkpointer
+    )
@@ -1,8 +1,11 @@
-import os
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import SystemMessage
 
+from agents.prompts import load_prompt
+
+VISUAL_PROMPT_FILE = 'visual_prompt.txt'
+
 
 def create_visual_agent(llm: BaseChatModel):
     """
@@ -12,12 +15,8 @@ def create_visual_agent(llm: BaseChatModel):
     The underlying LLM must be multimodal (e.g., V-JEPA2 with GPU, GPT-4o, Gemini 1.5 Pro)
     to interpret the Base64 image data after it's read by the tool.
     """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    prompts_dir = os.path.join(current_dir, '..', 'prompts')
-    visual_prompt_path = os.path.join(prompts_dir, 'visual_prompt.txt')
-
-    with open(visual_prompt_path, "r", encoding="utf-8") as f:
-        visual_prompt_content = f.read()
+    # prompts folder is resolved once at import time and the file read is cached
+    visual_prompt_content = load_prompt(VISUAL_PROMPT_FILE)
 
     # Construct the ChatPromptTemplate using from_messages
     prompt = ChatPromptTemplate.from_messages([
@@ -1,20 +1,56 @@
-from functools import partial
+import logging
+import os
+import re
+import uuid
+from functools import partial, lru_cache
 
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt.chat_agent_executor import AgentState
+from langgraph.types import Send
 
 from agents.audio import create_audio_agent
 from agents.interpreter import create_code_agent
 from agents.researcher import create_researcher_agent
 from agents.state import GaiaState, SubAgentState
 from agents.generic import create_generic_agent
-from agents.llm import create_orchestrator_llm, create_generic_llm, create_researcher_llm, create_audio_llm, \
-    create_visual_llm, create_interpreter_llm
+from agents.llm import create_all_llms
 from agents.orchestrator import create_orchestrator_agent
 from agents.visual import create_visual_agent
 from tools.visual_tools import read_image_and_encode
 
+logger = logging.getLogger(__name__)
+
+# Cap on LangGraph super-steps for the audio sub-agent's ReAct loop. Each tool round trip is 3 steps
+# (pre_model_hook -> model -> tools) and the final answer takes 2 more (pre_model_hook -> model), so 17 allows 5 tool
+# calls before create_react_agent stops gracefully with a "need more steps" answer,
+# transcription tasks rarely need more than that and this keeps a misbehaving loop from running unbounded.
+REACT_STEPS_PER_TOOL_ROUND_TRIP = 3
+AUDIO_AGENT_MAX_TOOL_ROUND_TRIPS = 5
+AUDIO_AGENT_RECURSION_LIMIT = AUDIO_AGENT_MAX_TOOL_ROUND_TRIPS * REACT_STEPS_PER_TOOL_ROUND_TRIP + 2
+
+# create_react_agent's ToolNode already runs the tool calls of one model turn in parallel on a thread pool,
+# this bounds how many of them (web searches, scrapes, file reads...) a sub-agent can have in flight at once
+TOOL_CONCURRENCY_LIMIT = int(os.getenv("TOOL_CONCURRENCY_LIMIT", "8"))
+
+# Names of the sub-agent nodes the router can hand over to, also used to build the conditional edges' path map
+SUB_AGENT_NAMES = frozenset({"generic", "researcher", "audio", "visual", "code"})
+
+# Sub-agents that must not run concurrently with themselves: the code agent diffs the working directory to find the
+# files a script created, so when the orchestrator fans out several code delegations at once they share one branch
+# and run one after the other
+SEQUENTIAL_AGENT_NAMES = frozenset({"code"})
+
+# Attached files whose type alone decides the sub-agent: (pattern on the file path, agent name, delegation arg holding it)
+# Compiled once, checked by fast_route_node before the first orchestrator turn
+FAST_ROUTES = [
+    (re.compile(r"\.(mp3|wav|m4a|flac|ogg)$", re.IGNORECASE), "audio", "file_path"),
+    (re.compile(r"\.(png|jpe?g|gif)$", re.IGNORECASE), "visual", "file_path"),
+    (re.compile(r"\.py$", re.IGNORECASE), "code", "code_path"),
+    (re.compile(r"\.(xlsx|xls|csv)$", re.IGNORECASE), "code", "input_path"),
+]
+
 
 # Helper functions
 def find_last_tool_call_id(messages: list) -> str | None:
@@ -28,7 +64,7 @@ def find_last_tool_call_id(messages: list) -> str | None:
 # Nodes
 def router_node(state: GaiaState) -> dict:
     print("---ROUTER NODE---")
-    updates = {"subagent_output": None}
+    updates = {"subagent_output": None, "parallel_delegations": None}
 
     # Find the last AIMessage to get the tool call
     last_ai_message = None
@@ -42,11 +78,31 @@ def router_node(state: GaiaState) -> dict:
         tool_name = tool_call['name']
 
         if tool_name.startswith("delegate_to_"):
-            agent_name = tool_name.replace("delegate_to_", "").replace("_agent", "")
-            arguments = tool_call['args']
-            print(f"  Delegating to '{agent_name}' with args: {arguments}")
-            updates['current_agent_name'] = agent_name
-            updates['subagent_input'] = arguments
+            # the orchestrator can delegate several independent tasks in a single turn
+            delegations = [
+                {
+                    "agent_name": call['name'].replace("delegate_to_", "").replace("_agent", ""),
+                    "args": call['args'],
+                    "tool_call_id": call['id']
+                }
+                for call in last_ai_message.tool_calls
+                if call['name'].startswith("delegate_to_")
+            ]
+            for delegation in delegations:
+                print(f"  Delegating to '{delegation['agent_name']}'")
+                # the arguments can be large (whole queries/file contents), only format them when debugging
+                logger.debug("Delegation args for '%s': %s", delegation['agent_name'], delegation['args'])
+
+            if len(delegations) > 1:
+                # fanned out by route_by_agent_name, each branch gets its own task via Send
+                updates['parallel_delegations'] = delegations
+                updates['current_agent_name'] = None
+                updates['subagent_input'] = None
+                updates['subagent_tool_call_id'] = None
+            else:
+                updates['current_agent_name'] = delegations[0]['agent_name']
+                updates['subagent_input'] = delegations[0]['args']
+                updates['subagent_tool_call_id'] = delegations[0]['tool_call_id']
 
         elif tool_name == 'provide_final_answer':
             final_answer = tool_call['args']['answer']
@@ -56,46 +112,86 @@ def router_node(state: GaiaState) -> dict:
     return updates
 
 
-def sub_agent_node(state: GaiaState, agent_runnable, agent_name: str) -> dict:
+def fast_route_node(state: GaiaState) -> dict:
+    """
+    Entry node skipping the orchestrator's first LLM turn when the attached file's type decides the sub-agent.
+    It emits the same delegation tool call the orchestrator would have made, so the router, the sub-agent's report
+    and the orchestrator's message history are unchanged. Anything else falls through to the orchestrator.
+    """
+    if file_path := state.get("file_path"):
+        for pattern, agent_name, path_arg in FAST_ROUTES:
+            if pattern.search(file_path):
+                print(f"---FAST ROUTE: {agent_name}---")
+                tool_call = {
+                    "name": f"delegate_to_{agent_name}_agent",
+                    "args": {"query": state["input"], path_arg: file_path},
+                    "id": f"fast_route_{uuid.uuid4().hex}",
+                    "type": "tool_call"
+                }
+                return {"messages": [AIMessage(content="", tool_calls=[tool_call], name="orchestrator")]}
+    return {}
+
+
+def sub_agent_node(state: GaiaState, agent_runnable, agent_name: str, recursion_limit: int | None = None) -> dict:
     """
     This node function manages the execution of a sub-agent.
     It creates an isolated environment, runs the agent, and processes its output.
+    recursion_limit optionally bounds the number of steps the sub-agent's ReAct loop may take (LangGraph's default otherwise).
     """
     print(f"---SUB AGENT NODE: {agent_name}---")
 
     task_args = state.get("subagent_input", {})
-    final_answer = ""
-
-    if agent_name == 'visual':
-        final_answer = pre_visual_state_logic(agent_runnable, task_args)
-    else:
-        final_answer = pre_subagent_state_logic(agent_name, agent_runnable, task_args)
+    final_answer = run_sub_agent(agent_name, agent_runnable, task_args, recursion_limit)
 
     print(f" {agent_name} agent finished execution.")
-    tool_call_id = find_last_tool_call_id(state['messages'])
+    # the router already found the delegation tool call, only fall back to scanning the history if it is missing
+    tool_call_id = state.get("subagent_tool_call_id") or find_last_tool_call_id(state['messages'])
     report_message = ToolMessage(
         content=final_answer,
         tool_call_id=tool_call_id
     )
     print("Prepared report for orchestrator.")
 
+    if state.get("is_parallel_branch"):
+        report_messages = [report_message]
+        # further delegations to a sequential agent (see SEQUENTIAL_AGENT_NAMES) were queued on this branch
+        for delegation in state.get("queued_delegations") or []:
+            queued_answer = run_sub_agent(agent_name, agent_runnable, delegation['args'], recursion_limit)
+            print(f" {agent_name} agent finished queued execution.")
+            report_messages.append(ToolMessage(content=queued_answer, tool_call_id=delegation['tool_call_id']))
+
+        # parallel branches run in the same step, only the messages channel has a reducer to merge their reports
+        return {"messages": report_messages}
+
     # Return all updates to the main state
     return {
         "messages": [report_message],
         "subagent_output": final_answer,
         "current_agent_name": None,  # Clear name
-        "subagent_input": None  # Clear input
+        "subagent_input": None,  # Clear input
+        "subagent_tool_call_id": None  # Clear tool call id
     }
 
 
-def pre_subagent_state_logic(agent_name, agent_runnable, task_args):
+def run_sub_agent(agent_name, agent_runnable, task_args, recursion_limit=None):
+    """Runs a single delegated task on the sub-agent and returns its final answer."""
+    if agent_name == 'visual':
+        return pre_visual_state_logic(agent_runnable, task_args)
+    return pre_subagent_state_logic(agent_name, agent_runnable, task_args, recursion_limit)
+
+
+def pre_subagent_state_logic(agent_name, agent_runnable, task_args, recursion_limit=None):
     formatted_input_string = " | ".join([f"{key}=>'{value}'" for key, value in task_args.items()])
     sub_agent_bubble_state = SubAgentState(
         input=formatted_input_string,
         messages=[HumanMessage(content=formatted_input_string)]
     )
-    print(f"Prepared bubble state for {agent_name} with formatted input: {formatted_input_string}")
-    final_sub_agent_state = agent_runnable.invoke(sub_agent_bubble_state)
+    print(f"Prepared bubble state for {agent_name}")
+    logger.debug("Formatted input for %s: %s", agent_name, formatted_input_string)
+    config = {"max_concurrency": TOOL_CONCURRENCY_LIMIT}
+    if recursion_limit:
+        config["recursion_limit"] = recursion_limit
+    final_sub_agent_state = agent_runnable.invoke(sub_agent_bubble_state, config=config)
     final_answer = final_sub_agent_state['messages'][-1].content
     return final_answer
 
@@ -109,7 +205,9 @@ def pre_visual_state_logic(agent_runnable, task_args):
     else:
         encoded_image = read_image_and_encode(file_path)  #
 
-        if "Error:" in encoded_image:
+        # a successful read is a 'data:' URI, errors are reported as a message starting with "Error", checking the
+        # prefix avoids scanning the whole (multi-MB) base64 payload for a marker
+        if encoded_image.startswith("Error"):
             final_answer = encoded_image
         else:
             multimodal_message = HumanMessage(
@@ -126,38 +224,69 @@ def pre_visual_state_logic(agent_runnable, task_args):
 
 
 # Routing functions
-def route_by_agent_name(state: GaiaState) -> str:
+def route_by_agent_name(state: GaiaState) -> str | list[Send]:
     """
-    Determines the next step after the orchestrator has run by inspecting the agent state
+    Determines the next step after the orchestrator has run by inspecting the agent state.
+    Several delegations in one orchestrator turn are fanned out with Send so the sub-agents run concurrently,
+    their reports are merged into messages before the orchestrator runs again.
+    Delegations to a sequential agent (SEQUENTIAL_AGENT_NAMES) are not fanned out, the first one gets a branch and
+    the others are queued on it.
     """
-    if next_agent := state.get("current_agent_name"):
-        print(f"Routing to agent: {next_agent}")
+    if delegations := state.get("parallel_delegations"):
+        # a delegation to an unknown agent has no node to go to, it is dropped rather than failing the run
+        delegations = [delegation for delegation in delegations if delegation['agent_name'] in SUB_AGENT_NAMES]
+        if delegations:
+            logger.debug("Routing in parallel to agents: %s", [delegation['agent_name'] for delegation in delegations])
+            branches = []
+            sequential_branches = {}
+            for delegation in delegations:
+                agent_name = delegation['agent_name']
+                if agent_name in sequential_branches:
+                    sequential_branches[agent_name]["queued_delegations"].append(delegation)
+                    continue
+
+                branch = {
+                    "messages": [],
+                    "subagent_input": delegation['args'],
+                    "subagent_tool_call_id": delegation['tool_call_id'],
+                    "is_parallel_branch": True
+                }
+                if agent_name in SEQUENTIAL_AGENT_NAMES:
+                    branch["queued_delegations"] = []
+                    sequential_branches[agent_name] = branch
+                branches.append(Send(agent_name, branch))
+            return branches
+    elif (next_agent := state.get("current_agent_name")) in SUB_AGENT_NAMES:
+        logger.debug("Routing to agent: %s", next_agent)
         return next_agent
-    else:
-        print("No agent designated. Ending workflow.")
-        return END
-
-
-# Entire workflow
-def create_worfklow():
-    try:
-        orchestrator_llm = create_orchestrator_llm()
-        print("Orchestrator LLM initialized\n")
 
-        generic_llm = create_generic_llm()
-        print("Generic LLM initialized.\n")
+    logger.debug("No agent designated. Ending workflow.")
+    return END
 
-        researcher_llm = create_researcher_llm()
-        print("Researcher LLM initialized.\n")
 
-        audio_llm = create_audio_llm()
-        print("Audio LLM initialized.\n")
+def route_after_fast_route(state: GaiaState) -> str:
+    """
+    Goes straight to the router when fast_route_node delegated the task, to the orchestrator otherwise
+    """
+    last_message = state["messages"][-1]
+    if isinstance(last_message, AIMessage) and last_message.tool_calls:
+        return "router"
+    return "orchestrator"
 
-        visual_llm = create_visual_llm()
-        print("Visual LLM initialized.\n")
 
-        code_llm = create_interpreter_llm()
-        print("Code LLM initialized.\n")
+# Entire workflow
+@lru_cache(maxsize=1)
+def create_worfklow():
+    """
+    Builds the LLMs, the sub-agents and the compiled LangGraph workflow.
+    Per-request state lives in the checkpointer under each run's thread_id, so the app is built once and shared
+    by every BasicAgent (a failed build raises and is not cached, so the next call retries).
+    """
+    try:
+        llms = create_all_llms()
+        orchestrator_llm, generic_llm, researcher_llm = llms["orchestrator"], llms["generic"], llms["researcher"]
+        audio_llm, visual_llm, code_llm = llms["audio"], llms["visual"], llms["code"]
+        print(f"LLMs initialized: {', '.join(llms)}\n")
     except Exception as e:
         print(f"Error initializing LLMs. Ensure API keys are set: {e}\n")
         raise
@@ -167,7 +296,11 @@ def create_worfklow():
     # orchestrator
     orchestrator_agent = create_orchestrator_agent(orchestrator_llm)
     workflow.add_node("orchestrator", orchestrator_agent)
-    workflow.set_entry_point("orchestrator")
+
+    # fast route, tasks whose attached file decides the sub-agent skip the first orchestrator turn
+    workflow.add_node("fast_route", fast_route_node)
+    workflow.set_entry_point("fast_route")
+    workflow.add_conditional_edges("fast_route", route_after_fast_route, {"router": "router", "orchestrator": "orchestrator"})
 
     # generic
     generic_agent = create_generic_agent(generic_llm)
@@ -194,7 +327,8 @@ def create_worfklow():
     audio_agent_node_func = partial(
         sub_agent_node,
         agent_runnable=audio_agent,
-        agent_name="audio"
+        agent_name="audio",
+        recursion_limit=AUDIO_AGENT_RECURSION_LIMIT
     )
     workflow.add_node("audio", audio_agent_node_func)
     workflow.add_edge("audio", "orchestrator")
@@ -227,16 +361,12 @@ def create_worfklow():
     workflow.add_conditional_edges(
         "router",
         route_by_agent_name,
-        {
-            "generic": "generic",
-            "researcher": "researcher",
-            "audio": "audio",
-            "visual": "visual",
-            "code": "code",
-            END: END
-        }
+        {**{agent_name: agent_name for agent_name in SUB_AGENT_NAMES}, END: END}
     )
 
-    app = workflow.compile()
+    # every run is checkpointed under its thread_id, so a run that failed mid-way on a transient error can be resumed
+    # from the last completed node (invoke(None, config) with the same thread_id) instead of replaying the orchestrator
+    # from scratch. The caller deletes the thread once the run is over (see BasicAgent._run_workflow)
+    app = workflow.compile(checkpointer=MemorySaver())
     print("LangGraph workflow compiled successfully.")
     return app
@@ -1,4 +1,5 @@
 import os
+import logging
 import gradio as gr
 import requests
 import pandas as pd
@@ -6,14 +7,22 @@ import re
 import mimetypes
 import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.messages import HumanMessage, AIMessage
 from langfuse import get_client
+from agents.llm import TRANSIENT_LLM_ERRORS
 from agents.workflow import create_worfklow
-from tools.audio_tools import model # this triggers the whisper model to be loaded
+from tools.audio_tools import load_whisper_model
 from agents.state import GaiaState
 from langfuse.langchain import CallbackHandler #
 
 
+# Routing/provider-fallback details are logged at DEBUG level by the agents, only INFO and above are shown by default
+logging.basicConfig(level=logging.INFO)
+# httpx logs every provider request at INFO ("HTTP Request: POST ..."), keep it to warnings
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
 # (Keep Constants as is)
 # --- Constants ---
 DEFAULT_API_URL = "https://agents-course-unit4-scoring.hf.space"
@@ -22,6 +31,16 @@ submit_url = f"{DEFAULT_API_URL}/submit"
 random_question_url = f"{DEFAULT_API_URL}/random-question"
 get_file_url = f"{DEFAULT_API_URL}/files/"  # append task_id to this
 
+# How many questions run_agent lets the workflow work on at the same time. Defaults to 1 (sequential) since the
+# code agent runs scripts in the current directory and diffs it to detect the files they create.
+agent_max_concurrency = int(os.getenv("AGENT_MAX_CONCURRENCY", "1"))
+
+# Compiled once, used to pull the filename out of the Content-Disposition header of downloaded task files
+content_disposition_filename_re = re.compile(r'filename="?([^";]+)"?', re.IGNORECASE)
+
+# Warm up the whisper model at startup so the first audio question doesn't pay for it
+load_whisper_model()
+
 with open('expected_answers.json', 'r', encoding='utf-8') as f:
     expected_answers = {item["task_id"]: item["Final answer"] for item in json.load(f)}
 
@@ -38,6 +57,8 @@ class BasicAgent:
         # --- Create the Master Orchestrator Workflow ---
         print("Creating master orchestrator workflow...")
         orchestrator_compiled_app = create_worfklow()
+        # the compiled app is shared, each run's checkpoints are dropped from its checkpointer once the run is over
+        self.checkpointer = orchestrator_compiled_app.checkpointer
         self.orchestrator_app = orchestrator_compiled_app.with_config(
             {"callbacks": [self.langfuse_handler]}
         )
@@ -46,6 +67,27 @@ class BasicAgent:
         print()
 
     def __call__(self, question: str, path: str | None) -> str:
+        initial_state = self._build_initial_state(question, path)
+
+        try:
+            final_state = self._run_workflow(initial_state)
+            return self._extract_final_answer(final_state)
+        except Exception as e:
+            print(f"Error during workflow execution: {e}")
+            return f"An error occurred while processing your request: {e}"
+        finally:
+            self._flush_traces()
+
+    def batch(self, questions: list[tuple[str, str | None]], max_concurrency: int = 1) -> list[str]:
+        """
+        Runs the workflow on several (question, path) pairs, with at most max_concurrency questions in flight at a time.
+        Each question goes through __call__ on its own thread, so max_concurrency never ends up in a run's config
+        (where it would also cap the parallel sub-agents inside that run). Answers are returned in input order.
+        """
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            return list(executor.map(lambda question_and_path: self(*question_and_path), questions))
+
+    def _build_initial_state(self, question: str, path: str | None) -> GaiaState:
         print(f"\nAgent received question (first 50 chars): {question[:50]}")
         print(f"Path: {path}")
 
@@ -58,37 +100,51 @@ class BasicAgent:
         initial_state: GaiaState = { # Explicitly type as AgentState
             "input": full_input_content,
             "messages": [HumanMessage(content=full_input_content)],
+            "file_path": path,
             "final_answer": "",
             "remaining_steps": 30
         }
 
         print(f"\n--- Running orchestrator workflow for: '{full_input_content}' ---")
+        return initial_state
 
+    def _run_workflow(self, initial_state: GaiaState) -> GaiaState:
+        """
+        Invokes the workflow on its own checkpointer thread. If a provider call fails with a transient error
+        (connection, timeout, rate limit, 5xx) the run is resumed once from its last checkpoint, so only the failed node
+        is re-run. Any other error is raised as is. The thread's checkpoints are deleted once the run is over.
+        """
+        thread_id = str(uuid.uuid4())
+        run_config = {"configurable": {"thread_id": thread_id}}
         try:
             # Invoke the workflow. We are using .invoke() here for simplicity
             # For streaming or more detailed progress, you might iterate over .stream()
-            final_state: GaiaState = self.orchestrator_app.invoke(initial_state)
-
-            # Extract the final answer from the state
-            if final_state.get("final_answer"):
-                print(f"\n--- Orchestrator Final Answer ---")
-                return final_state["final_answer"]
-            else:
-                print("\n--- Orchestrator completed, but no explicit 'final_answer' was extracted. ---")
-                # Fallback: Return the content of the last AI message if no specific final_answer was set
-                if final_state.get("messages"):
-                    last_message = final_state["messages"][-1]
-                    if isinstance(last_message, AIMessage):
-                        return last_message.content
-                return "Workflow completed, but no clear answer was found."
-
-        except Exception as e:
-            print(f"Error during workflow execution: {e}")
-            return f"An error occurred while processing your request: {e}"
+            try:
+                return self.orchestrator_app.invoke(initial_state, config=run_config)
+            except TRANSIENT_LLM_ERRORS as e:
+                print(f"Transient error during workflow execution: {e}, resuming from the last checkpoint...")
+                return self.orchestrator_app.invoke(None, config=run_config)
         finally:
-            print("Flushing Langfuse traces...")
-            get_client().flush()
-            print("Langfuse traces flushed.")
+            self.checkpointer.delete_thread(thread_id)
+
+    def _extract_final_answer(self, final_state: GaiaState) -> str:
+        # Extract the final answer from the state
+        if final_state.get("final_answer"):
+            print(f"\n--- Orchestrator Final Answer ---")
+            return final_state["final_answer"]
+
+        print("\n--- Orchestrator completed, but no explicit 'final_answer' was extracted. ---")
+        # Fallback: Return the content of the last AI message if no specific final_answer was set
+        if final_state.get("messages"):
+            last_message = final_state["messages"][-1]
+            if isinstance(last_message, AIMessage):
+                return last_message.content
+        return "Workflow completed, but no clear answer was found."
+
+    def _flush_traces(self):
+        print("Flushing Langfuse traces...")
+        get_client().flush()
+        print("Langfuse traces flushed.")
 
 
 # Helper methods
@@ -293,7 +349,7 @@ def get_task_file(task_id: str, save_dir="."):
         # 1. Extract filename from Content-Disposition using regex for robustness
         content_disp = response.headers.get("Content-Disposition", "")
         filename = None
-        match = re.search(r'filename="?([^";]+)"?', content_disp, re.IGNORECASE)
+        match = content_disposition_filename_re.search(content_disp)
 
         if match:
             filename = match.group(1)
@@ -314,23 +370,26 @@ def get_task_file(task_id: str, save_dir="."):
         return None
 
 
-def run_agent(agent, questions_data):
+def run_agent(agent, questions_data, max_concurrency: int = agent_max_concurrency):
     results_log = []
     answers_payload = []
-    print(f"Running agent on {len(questions_data)} questions...\n")
+    print(f"Running agent on {len(questions_data)} questions (max concurrency: {max_concurrency})...\n")
 
+    # 1. Prepare every question (fetch associated files) before running the agent on them
+    runnable_items = []
     for i, item in enumerate(questions_data):
         task_id = item.get("task_id")
         question_text = item.get("question")
         file_name = item.get("file_name")
 
-        print("\n" + "-" * 30 + f"|START {i+1}|" + "-" * 30)
+        print("\n" + "-" * 30 + f"|TASK {i+1}|" + "-" * 30)
         if not task_id or question_text is None:
             print(f"Skipping item with missing task_id or question: {item}")
             continue
 
         expected_answer = expected_answers.get(task_id, "")
         item["expected_answer"] = expected_answer
+        results_log.append(item)
 
         # ✅ Check if there is an associated file and attempt to fetch it
         fetched_path = None
@@ -340,24 +399,27 @@ def run_agent(agent, questions_data):
                 err_msg = f"FILE DOWNLOAD ERROR for task {task_id}"
                 print(err_msg)
                 item["submitted_answer"] = err_msg
-                results_log.append(item)
                 continue  # Skip this task and move to next
 
-        print(f"Running agent on question: {question_text}. \n")
+        print(f"Queued question: {question_text}. \n")
         print(f"Question has file associated with it ? : {fetched_path != None} \n")
+        runnable_items.append((item, fetched_path))
 
-        try:
-            submitted_answer = agent(question_text, fetched_path)
-            answers_payload.append({"task_id": task_id, "submitted_answer": submitted_answer})
+    # 2. Run the agent on all prepared questions in one batch
+    try:
+        submitted_answers = agent.batch(
+            [(item["question"], fetched_path) for item, fetched_path in runnable_items],
+            max_concurrency=max_concurrency
+        )
+        for (item, _), submitted_answer in zip(runnable_items, submitted_answers):
+            answers_payload.append({"task_id": item["task_id"], "submitted_answer": submitted_answer})
             item["submitted_answer"] = submitted_answer
-        except Exception as e:
-            err_msg = f"AGENT ERROR on task {task_id}: {e}"
-            print(err_msg)
+    except Exception as e:
+        err_msg = f"AGENT ERROR: {e}"
+        print(err_msg)
+        for item, _ in runnable_items:
             item["submitted_answer"] = err_msg
 
-        results_log.append(item)
-        print("-" * 30 + f"|END {i+1}|" + "-" * 30 + "\n")
-
     print(f"Finished running agent on {len(questions_data)} questions...!\n")
     return answers_payload, results_log
 
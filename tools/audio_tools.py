@@ -1,12 +1,23 @@
 import os
 
-import whisper
+from functools import lru_cache
 from urllib.parse import urlparse, parse_qs
 from langchain_core.tools import tool
 from yt_dlp import YoutubeDL
 
-# Load the base model (globally)
-model = whisper.load_model("tiny")
+
+@lru_cache(maxsize=1)
+def load_whisper_model():
+    """
+    Loads the Whisper model (tiny) once and reuses it afterwards.
+    whisper (and torch underneath it) is only imported here, so importing this module stays cheap
+    until a transcription is actually needed.
+
+    Returns:
+        whisper.Whisper: The loaded Whisper model.
+    """
+    import whisper
+    return whisper.load_model("tiny")
 
 @tool
 def transcribe_audio(file_path: str) -> str:
@@ -20,7 +31,7 @@ def transcribe_audio(file_path: str) -> str:
         str: Transcribed text.
     """
     try:
-        result = model.transcribe(file_path)
+        result = load_whisper_model().transcribe(file_path)
         return result["text"]
     except Exception as e:
         return f"Error transcribing audio: {e}"
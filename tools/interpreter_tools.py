@@ -1,9 +1,13 @@
+import logging
 import os
 import subprocess
 import uuid
 from typing import Dict, Any, Optional, List
 from langchain_core.tools import tool
 
+# tool inputs/outputs (whole scripts, shell output) can be large, they are only formatted when debug logging is on
+logger = logging.getLogger(__name__)
+
 
 # --- File System Tools ---
 
@@ -48,7 +52,7 @@ def run_shell_command(command: str) -> Dict[str, str]:
     """
     try:
         # Using shell=True for convenience, but be mindful of security if exposed directly to untrusted input.
-        print(f"running shell command {command}")
+        logger.debug("running shell command %s", command)
         result = subprocess.run(
             command,
             shell=True,
@@ -58,19 +62,19 @@ def run_shell_command(command: str) -> Dict[str, str]:
             timeout=120  # Timeout after 120 seconds
         )
         output = {"stdout": result.stdout, "stderr": result.stderr}
-        print(f"shell output: {output}")
+        logger.debug("shell output: %s", output)
         return output
     except subprocess.CalledProcessError as e:
         output = {"status": "error", "stdout": e.stdout, "stderr": e.stderr, "exit_code": str(e.returncode)}
-        print(f"error shell output: {output}")
+        logger.debug("error shell output: %s", output)
         return output
     except subprocess.TimeoutExpired as e:
         output = {"status": "error", "stdout": e.stdout, "stderr": f"Command timed out after {e.timeout} seconds."}
-        print(f"error shell output: {output}")
+        logger.debug("error shell output: %s", output)
         return output
     except Exception as e:
         output = {"status": "error", "message": f"An unexpected error occurred: {str(e)}"}
-        print(f"error shell output: {output}")
+        logger.debug("error shell output: %s", output)
         return output
 
 
@@ -100,8 +104,8 @@ def run_python_script(script_path: str) -> Dict[str, Any]:
         if not os.path.exists(script_path):
             raise FileNotFoundError(f"Python script '{script_path}' not found in current directory.")
 
-        content = read_file(script_path)
-        print(f"Content read from {script_path} is {content}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Content read from %s is %s", script_path, read_file(script_path))
 
         # Get initial files in current directory before execution
         initial_files = set(os.listdir(current_dir)) if os.path.exists(current_dir) else set()
@@ -145,7 +149,7 @@ def run_python_script(script_path: str) -> Dict[str, Any]:
         "stderr": stderr,
         "created_files": created_files
     }
-    print(f"run-python-script result is {result}")
+    logger.debug("run-python-script result is %s", result)
     return result
 
 
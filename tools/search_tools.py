@@ -1,10 +1,29 @@
 # This file contains tools related to search.
+import threading
 from typing import Union, List, Dict, Any
 
+import requests
 from langchain_community.document_loaders import WikipediaLoader, WebBaseLoader, ArxivLoader
+from langchain_community.document_loaders.web_base import default_header_template
 from langchain_core.tools import tool
 from duckduckgo_search import DDGS
 
+# Reused across web_scraper calls so connections (and TLS sessions) to the same hosts are kept alive,
+# WebBaseLoader would otherwise open a brand new requests.Session on every call.
+# requests.Session is not thread-safe and web_scraper runs on ToolNode's pool and in parallel Send branches,
+# so every thread gets its own session
+_scraper_sessions = threading.local()
+
+
+def get_scraper_session() -> requests.Session:
+    """Returns the calling thread's scraper session, creating it on first use."""
+    session = getattr(_scraper_sessions, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(default_header_template)
+        _scraper_sessions.session = session
+    return session
+
 
 @tool
 def web_search(query: str, max_results: int = 3) -> Dict[str, List[Dict[str, str]]]:
@@ -23,17 +42,15 @@ def web_search(query: str, max_results: int = 3) -> Dict[str, List[Dict[str, str
         - 'url': The URL of the search result (str).
         - 'body': A snippet/summary of the search result content (str).
     """
-    results = []
     with DDGS() as ddgs:
-        for r in ddgs.text(query, max_results=max_results):
-            title = r.get("title", "")
-            href = r.get("href", "")
-            body = r.get("body", "")
-            results.append({
-                "title": title,
-                "url": href,
-                "body": body
-            })
+        results = [
+            {
+                "title": r.get("title", ""),
+                "url": r.get("href", ""),
+                "body": r.get("body", "")
+            }
+            for r in ddgs.text(query, max_results=max_results)
+        ]
 
     return {"web_results": results}
 
@@ -60,15 +77,16 @@ def arxiv_search(query: str, max_results: int = 2) -> Dict[str, List[Dict[str, A
     loader = ArxivLoader(query=query, load_max_docs=max_results)
     docs = loader.load()
 
-    results = []
-    for doc in docs:
-        results.append({
+    results = [
+        {
             "published": doc.metadata.get("published", ""),
             "title": doc.metadata.get("Title", ""),
             "authors": doc.metadata.get("Authors", ""),
             "summary": doc.metadata.get("Summary", ""),
             "content": doc.page_content
-        })
+        }
+        for doc in docs
+    ]
 
     return {"arxiv_results": results}
 
@@ -93,14 +111,15 @@ def wikipedia_search(query: str, load_max_docs: int = 3) -> Dict[str, List[Dict[
     """
     docs = WikipediaLoader(query=query, load_max_docs=load_max_docs).load()
 
-    results = []
-    for doc in docs:
-        results.append({
+    results = [
+        {
             "source": doc.metadata.get("source", ""),
             "summary": doc.metadata.get("summary", ""),
             "page": doc.metadata.get("page", ""),
             "content": doc.page_content
-        })
+        }
+        for doc in docs
+    ]
 
     return {"wiki_results": results}
 
@@ -124,17 +143,18 @@ def web_scraper(urls: List[str]) -> Dict[str, Dict[str, Any]]:
     loader = WebBaseLoader(
         web_path=urls,
         continue_on_failure=True,
-        default_parser="html.parser"
+        default_parser="html.parser",
+        session=get_scraper_session()
     )
     docs = loader.load()
 
-    results = {}
-    for doc in docs:
-        url = doc.metadata.get("source", "unknown_url")
-        results[url] = {
+    results = {
+        doc.metadata.get("source", "unknown_url"): {
             "content": doc.page_content[:12000], #only use 12000 chars
             "metadata": doc.metadata
         }
+        for doc in docs
+    }
 
     return results
 